@@ -1,84 +1,184 @@
 # Central dashboard that runs on laptop to monitor raspberry pi devices
 
-from flask import Flask, render_template, jsonify
-import requests
+from flask import Flask, Response, render_template
+from json_response import dumps, json_response
+import aiohttp
+import asyncio
 import threading
 import time
 
 app = Flask(__name__)
 
 #Global storage for discovered devices
-discovered_devices = {}
+# Only the state applier writes these, always by swapping in a new object,
+# so readers can grab a reference without taking a lock
+_devices_snapshot = ()   # Tuple of (device_id, device_info) pairs
 device_health_data = {}
-discovery_lock = threading.Lock()
 
-def scan_for_devices():
+# Bumped every time the published state changes
+last_health_update_ts = 0.0
+
+# Responses rebuilt once per state change, routes only hand out the bytes
+_bulk_payload = b'{"devices":[]}'   # Health for every device
+_devices_response = (b'{"error":"No devices found"}', 404)   # First device (payload, status)
+
+# Notified after each state change so SSE streams can push the new payload
+_health_changed = threading.Condition()
+SSE_KEEPALIVE_INTERVAL = 15
+
+# Each open stream holds a server thread (gunicorn_conf.py threads) for as long
+# as the page is open, so only this many are allowed at once. Extra pages get a
+# 503 and fall back to polling bulk_health
+SSE_MAX_STREAMS = 4
+_stream_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+async def scan_loop(events):
     # Continously scan for EweGo devices
     
-    from scan_network import scan_network
+    from scan_network import scan_network_async, DEFAULT_MAX_WORKERS
     
-    while True:
-        try:
-            print(f"Scanning for devices...")
-            devices = scan_network(max_workers=50)
+    # One pool for every scan. Keep-alive outlasts the scan interval, so known
+    # devices are re-probed without a new handshake
+    connector = aiohttp.TCPConnector(limit=DEFAULT_MAX_WORKERS, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        while True:
+            try:
+                print(f"Scanning for devices...")
+                devices = await scan_network_async(session=session)
             
-            with discovery_lock:
-                # Update discovered devices
-                discovered_devices.clear()
-                for device in devices:
-                    device_id= device['device_id']
-                    discovered_devices[device_id] = {
+                new_snapshot = tuple(
+                    (device['device_id'], {
                         'ip': device['ip'],
                         'url': f"http://{device['ip']}:5000",
                         'device_name': device['device_name']
-                    }
+                    })
+                    for device in devices
+                )
+                await events.put(('scan', new_snapshot))
+            
                 if devices:
                     print(f"Found {len(devices)} devices(s)")
                 else:
                     print("No devices found")
-        except Exception as e:
-            print(f"Discovery error: {e}")
+            except Exception as e:
+                print(f"Discovery error: {e}")
             
-        # Scan every 30 seconds
-        time.sleep(30)
+            # Scan every 30 seconds
+            await asyncio.sleep(30)
+        
+async def fetch_health(session, device_id, url):
+    # Fetch health data from a single device
+    async with session.get(url, timeout=aiohttp.ClientTimeout(total=3)) as response:
+        if response.status == 200:
+            data = await response.json()
+            return {
+                'status': 'online',
+                'data': data,
+                'last_updated': time.time()
+            }
+        
+        return {
+            'status': 'error',
+            'data': None,
+            'last_updated': time.time()
+        }
         
-def poll_device_health():
+async def poll_once(session):
+    # Polls every known device concurrently, returns the new health table
+    snap = _devices_snapshot
+    tasks = [fetch_health(session, device_id, f"{device_info['url']}/api/health")
+             for device_id, device_info in snap]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    new_health = {}
+    for (device_id, _), result in zip(snap, results):
+        if isinstance(result, Exception):
+            # Unreachable or bad response, mark as offline
+            new_health[device_id] = {
+                'status': 'offline',
+                'data': None,
+                'last_updated': time.time()
+            }
+        else:
+            new_health[device_id] = result
+            
+    return new_health
+                
+async def poll_loop(events):
     # Polls all devices for health data
+    # Keep one session (and its keep-alive connections) open across poll cycles
+    connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        while True:
+            await events.put(('health', await poll_once(session)))
+            
+            # Poll every 2 seconds
+            await asyncio.sleep(2)
+            
+def publish_state():
+    # Rebuild the route responses from the current state and wake SSE streams
+    global _bulk_payload, _devices_response, last_health_update_ts
+    
+    snap = _devices_snapshot
+    health_data = device_health_data
+    
+    _bulk_payload = dumps({
+        'devices': [
+            {
+                'device_id': device_id,
+                'device_name': device_info['device_name'],
+                'ip': device_info['ip'],
+                **health_data.get(device_id, {
+                    'status': 'unknown',
+                    'data': None,
+                    'last_updated': None
+                })
+            }
+            for device_id, device_info in snap
+        ]
+    })
+    
+    # Single-device view is the first discovered device
+    if not snap:
+        _devices_response = (dumps({'error': 'No devices found'}), 404)
+    else:
+        device_id = snap[0][0]
+        health = health_data.get(device_id, {})
+        
+        if health.get('data'):
+            _devices_response = (dumps(health['data']), 200)
+        else:
+            _devices_response = (dumps({
+                'error': 'Device offline',
+                'device_id': device_id
+            }), 503)
+            
+    # Publish the update only once the payloads are in place
+    with _health_changed:
+        last_health_update_ts = time.monotonic()
+        _health_changed.notify_all()
+            
+async def state_applier(events):
+    # Sole writer of device state, applies scan and health events in order
+    global _devices_snapshot, device_health_data
     
     while True:
-        with discovery_lock:
-            devices_to_poll = dict(discovered_devices)
+        kind, value = await events.get()
+        
+        if kind == 'scan':
+            _devices_snapshot = value
+        elif kind == 'health':
+            device_health_data = value
             
-        for device_id, device_info in devices_to_poll.items():
-            try:
-                url = f"{device_info['url']}/api/health"
-                response = requests.get(url, timeout=3)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    with discovery_lock:
-                        device_health_data[device_id] = {
-                            'status': 'online',
-                            'data': data,
-                            'last_updated': time.time()
-                        }
-                else:
-                    with discovery_lock:
-                        device_health_data[device_id] = {
-                            'status': 'error',
-                            'data': None,
-                            'last_updated': time.time()
-                        }
-            except Exception as e:
-                with discovery_lock:
-                    device_health_data[device_id] = {
-                        'status': 'offline',
-                        'data': None,
-                        'last_updated': time.time()
-                    }
-        # Poll every 2 seconds
-        time.sleep(2)
+        publish_state()
+            
+async def run_background():
+    # Discovery and polling share one event loop and report to one writer
+    events = asyncio.Queue()
+    await asyncio.gather(state_applier(events), scan_loop(events), poll_loop(events))
+    
+def run_event_loop():
+    asyncio.run(run_background())
     
 
 
@@ -93,21 +193,46 @@ def dashboard():
 @app.route('/api/devices')
 def get_devices():
     
-    #Returns all discovered devices and their health data
-    with discovery_lock:
-        devices_list= []
-        for device_id, device_info in discovered_devices.items():
+    #Returns the first discovered device's health data
+    payload, status = _devices_response
+    return Response(payload, status=status, mimetype='application/json')
             
-            health = device_health_data.get(device_id, {})
-        
-            if health.get('data'):
-                return jsonify(health['data'])
-            else:
-                return jsonify({
-                    'error': 'Device offline',
-                    'device_id': device_id
-            }), 503
             
+@app.route('/api/devices/bulk_health')
+def get_bulk_health():
+    
+    # Returns health for every device in one response
+    return Response(_bulk_payload, mimetype='application/json')
+            
+def event_stream():
+    # Yields the bulk payload each time the poller publishes new health
+    last_sent = None
+    while True:
+        with _health_changed:
+            _health_changed.wait_for(lambda: last_health_update_ts != last_sent,
+                                     timeout=SSE_KEEPALIVE_INTERVAL)
+            update_ts, payload = last_health_update_ts, _bulk_payload
+            
+        if update_ts == last_sent:
+            # Nothing new, a comment line keeps the connection from idling out
+            yield b': keep-alive\n\n'
+            continue
+        
+        last_sent = update_ts
+        yield b'data: ' + payload + b'\n\n'
+
+@app.route('/api/devices/stream')
+def stream_devices():
+    
+    # Server-Sent Events stream of the bulk health payload
+    if not _stream_slots.acquire(blocking=False):
+        return Response(status=503, headers={'Retry-After': str(SSE_KEEPALIVE_INTERVAL)})
+    
+    resp = Response(event_stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+    # Free the slot once the server closes the response (client went away)
+    resp.call_on_close(_stream_slots.release)
+    return resp
             
 @app.route('/api/health')
 def get_health():
@@ -115,21 +240,8 @@ def get_health():
     Returns health data for single-device dashboard
     Gets the first discovered device's data
     """
-    with discovery_lock:
-        if not discovered_devices:
-            return jsonify({'error': 'No devices found'}), 404
-        
-        # Get first device
-        device_id = list(discovered_devices.keys())[0]
-        health = device_health_data.get(device_id, {})
-        
-        if health.get('data'):
-            return jsonify(health['data'])
-        else:
-            return jsonify({
-                'error': 'Device offline',
-                'device_id': device_id
-            }), 503
+    payload, status = _devices_response
+    return Response(payload, status=status, mimetype='application/json')
     
 # Start the recording of the devices from dashboard
 @app.route('/api/device/<device_id>/toggle_recording', methods=['POST'])
@@ -139,11 +251,17 @@ def toggle_recording(device_id):
     
     # Call the dual_camera script from here
     
-    return jsonify({
+    return json_response({
         'recording': recording_state,
         'message': 'Recording started' if recording_state else 'Recording stopped'
     })
     
+def start_services():
+    # Start the background event loop, called once per serving process
+    print("Starting device discovery and health polling...")
+    background_thread = threading.Thread(target=run_event_loop, daemon=True)
+    background_thread.start()
+    
 if __name__ == '__main__':
     print("=" * 60)
     print("EweGo Dashboard Starting...")
@@ -151,14 +269,7 @@ if __name__ == '__main__':
     print("\nThis dashboard monitors ALL Raspberry Pi devices")
     print()
     
-    # Start background threads
-    print("Starting device discovery thread...")
-    discovery_thread = threading.Thread(target=scan_for_devices, daemon=True)
-    discovery_thread.start()
-    
-    print("Starting health polling thread...")
-    health_thread = threading.Thread(target=poll_device_health, daemon=True)
-    health_thread.start()
+    start_services()
     
     print("\nStarting web server...")
     print("   Access dashboard at: http://localhost:5000")
@@ -23,10 +23,15 @@ class EweGoListener(ServiceListener):
         """Called when new device is discovered"""
         info = zc.get_service_info(type_, name)
         if info:
-            # Parsing device information
-            device_id = info.properties.get(b'device_id', b'unknown').decode('utf-8')
-            service_name = info.properties.get(b'service', b'Unknown').decode('utf-8')
-            version = info.properties.get(b'version', b'?').decode('utf-8')
+            # Parsing device information, decoding each property once
+            props = {k.decode('utf-8'): v.decode('utf-8')
+                     for k, v in info.properties.items() if v is not None}
+            device_id = props.get('device_id', 'unknown')
+            service_name = props.get('service', 'Unknown')
+            version = props.get('version', '?')
+            
+            hostname = info.server.rstrip('.')
+            url_base = f"http://{hostname}:{info.port}"
             
             # Get IP address
             if info.addresses:
@@ -41,17 +46,17 @@ class EweGoListener(ServiceListener):
                 'version': version,
                 'ip': ip_address,  # Changed from 'ip_address' to 'ip'
                 'port': info.port,
-                'hostname': info.server.rstrip('.')
+                'hostname': hostname
             }
             
             # Print discovery info
             print(f"\n✅ Found device: {device_id}")
             print(f"   Service: {service_name}")
-            print(f"   Hostname: {info.server.rstrip('.')}")
+            print(f"   Hostname: {hostname}")
             print(f"   IP: {ip_address}")
             print(f"   Port: {info.port}")
-            print(f"   URL: http://{info.server.rstrip('.')}:{info.port}")
-            print(f"   API: http://{info.server.rstrip('.')}:{info.port}/api/health")
+            print(f"   URL: {url_base}")
+            print(f"   API: {url_base}/api/health")
     
     def update_service(self, zc: Zeroconf, type_: str, name: str) -> None:
         """Called when service is updated"""
@@ -108,48 +113,63 @@ def print_summary(devices):
         print()
 
 
+def probe_device(session, info):
+    """Probe one device's health API, returning the report lines to print"""
+    import requests
+    
+    lines = [f"Testing {info['device_id']}..."]
+    
+    # Try hostname first
+    url = f"http://{info['hostname']}:{info['port']}/api/health"
+    
+    try:
+        response = session.get(url, timeout=5)
+        if response.status_code == 200:
+            data = response.json()
+            lines.append(f"   Connected successfully")
+            lines.append(f"   Battery: {data.get('battery', {}).get('level', 'N/A')}%")
+            lines.append(f"   GPS: {data.get('gps', {}).get('fix', 'unknown')}")
+            lines.append(f"   Recording: {data.get('recording', False)}")
+        else:
+            lines.append(f"   ⚠️  Connected but got status code: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        lines.append(f"   ❌ Connection failed: {e}")
+        
+        # Try IP address as fallback
+        if info['ip'] != 'unknown':
+            lines.append(f"   Trying IP address...")
+            url_ip = f"http://{info['ip']}:{info['port']}/api/health"
+            try:
+                response = session.get(url_ip, timeout=5)
+                if response.status_code == 200:
+                    lines.append(f"Connected via IP address")
+                else:
+                    lines.append(f"IP connection failed too")
+            except:
+                lines.append(f"IP connection failed too")
+                
+    return lines
+
+
 def test_device_connection(devices):
     """Test HTTP connection to discovered devices"""
     import requests
+    from concurrent.futures import ThreadPoolExecutor
     
     print("=" * 60)
     print("Testing Device Connections")
     print("=" * 60)
     print()
     
-    for name, info in devices.items():
-        print(f"Testing {info['device_id']}...")
+    # Probe all devices at once over one pooled session, then report in order
+    with requests.Session() as session, \
+         ThreadPoolExecutor(max_workers=min(32, len(devices))) as executor:
+        reports = executor.map(lambda info: probe_device(session, info), devices.values())
         
-        # Try hostname first
-        url = f"http://{info['hostname']}:{info['port']}/api/health"
-        
-        try:
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
-                data = response.json()
-                print(f"   Connected successfully")
-                print(f"   Battery: {data.get('battery', {}).get('level', 'N/A')}%")
-                print(f"   GPS: {data.get('gps', {}).get('fix', 'unknown')}")
-                print(f"   Recording: {data.get('recording', False)}")
-            else:
-                print(f"   ⚠️  Connected but got status code: {response.status_code}")
-        except requests.exceptions.RequestException as e:
-            print(f"   ❌ Connection failed: {e}")
-            
-            # Try IP address as fallback
-            if info['ip'] != 'unknown':
-                print(f"   Trying IP address...")
-                url_ip = f"http://{info['ip']}:{info['port']}/api/health"
-                try:
-                    response = requests.get(url_ip, timeout=5)
-                    if response.status_code == 200:
-                        print(f"Connected via IP address")
-                    else:
-                        print(f"IP connection failed too")
-                except:
-                    print(f"IP connection failed too")
-        
-        print()
+        for lines in reports:
+            for line in lines:
+                print(line)
+            print()
 
 
 if __name__ == "__main__":
@@ -4,11 +4,13 @@ Simulates realistic sensor data without requiring actual hardware
 Run this instead of app.py to test UI
 """
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template
+from json_response import json_response
 from datetime import datetime
+import numpy as np
+import os
 import random
 import time
-import math
 
 app = Flask(__name__)
 
@@ -20,127 +22,114 @@ sync_state = {
     'pending_files': 0
 }
 
+# Bound once, called on every health request
+_now = datetime.now
+
 # Simulation parameters
-start_time = time.time()
-battery_start = 85.0  # Start at 85%
-gps_fix_time = None  # When GPS gets fix
+# Every simulated device is one slot in these arrays, so a whole fleet is
+# advanced with a single vectorized NumPy pass per request
+SIM_DEVICES = max(1, int(os.environ.get('SIM_DEVICES', 1)))
+start_time = np.full(SIM_DEVICES, time.time())
+battery_start = np.full(SIM_DEVICES, 85.0)  # Start at 85%
+GPS_FIX_DELAY = 45  # Seconds before GPS gets fix
 
-def simulate_gps_data():
-    """Simulate GPS acquiring fix and drifting slightly"""
-    global gps_fix_time
+def simulate_gps_data(now):
+    """Simulate GPS acquiring fix and drifting slightly, for every device"""
+    n = SIM_DEVICES
+    elapsed = now - start_time
+    has_fix = elapsed >= GPS_FIX_DELAY
     
-    current_time = time.time()
-    elapsed = current_time - start_time
+    # Before the fix satellites are gradually acquired, after it they jitter
+    satellites = np.where(has_fix,
+                          np.random.randint(10, 16, n),
+                          np.minimum(elapsed // 5, 8).astype(int))
     
-    # Simulate GPS taking 30-60 seconds to get first fix
-    if elapsed < 45:
-        return {
-            'connected': True,
-            'fix': 'no fix',
-            'satellites': min(int(elapsed / 5), 8),  # Gradually acquire satellites
-            'latitude': 0.0,
-            'longitude': 0.0,
-            'altitude': 0.0,
-            'available': True
-        }
-    else:
-        # GPS has fix - simulate slight drift (like real GPS)
-        if gps_fix_time is None:
-            gps_fix_time = current_time
-        
-        time_since_fix = current_time - gps_fix_time
-        
-        # Base coordinates (adjust to your location for realism)
-        base_lat = 33.7490  # Atlanta, GA area
-        base_lon = -84.3880
-        
-        # Add small random drift (realistic GPS jitter)
-        lat_drift = math.sin(time_since_fix / 10) * 0.00001
-        lon_drift = math.cos(time_since_fix / 10) * 0.00001
-        
-        return {
-            'connected': True,
-            'fix': '3D',
-            'satellites': random.randint(10, 15),
-            'latitude': base_lat + lat_drift,
-            'longitude': base_lon + lon_drift,
-            'altitude': 320.5 + random.uniform(-1, 1),
-            'available': True
-        }
+    # Base coordinates (adjust to your location for realism)
+    base_lat = 33.7490  # Atlanta, GA area
+    base_lon = -84.3880
+    
+    # Add small drift (realistic GPS jitter) once there is a fix
+    time_since_fix = np.maximum(elapsed - GPS_FIX_DELAY, 0)
+    latitude = np.where(has_fix, base_lat + np.sin(time_since_fix / 10) * 0.00001, 0.0)
+    longitude = np.where(has_fix, base_lon + np.cos(time_since_fix / 10) * 0.00001, 0.0)
+    altitude = np.where(has_fix, 320.5 + np.random.uniform(-1, 1, n), 0.0)
+    
+    return {
+        'fix': np.where(has_fix, '3D', 'no fix').tolist(),
+        'satellites': satellites.tolist(),
+        'latitude': latitude.tolist(),
+        'longitude': longitude.tolist(),
+        'altitude': altitude.tolist()
+    }
 
-def simulate_battery_data():
+def simulate_battery_data(now):
     """Simulate battery draining when recording, charging when not"""
-    global battery_start, recording_state
-    
-    elapsed_hours = (time.time() - start_time) / 3600
+    elapsed_hours = (now - start_time) / 3600
     
     if recording_state:
         # Drain 5% per hour when recording
         level = battery_start - (elapsed_hours * 5)
-        status = 'discharging'
     else:
         # Charge 10% per hour when not recording
-        level = min(100, battery_start + (elapsed_hours * 10))
-        status = 'charging' if level < 100 else 'full'
+        level = battery_start + (elapsed_hours * 10)
+    np.clip(level, 0, 100, out=level)
     
-    level = max(0, min(100, level))
+    if recording_state:
+        status = np.full(SIM_DEVICES, 'discharging')
+    else:
+        status = np.where(level < 100, 'charging', 'full')
     
     return {
-        'level': int(level),
-        'status': status,
-        'voltage': 11.8 + (level / 100 * 0.8),  # 11.8V to 12.6V range
-        'available': True
+        'level': level.astype(int).tolist(),
+        'status': status.tolist(),
+        'voltage': (11.8 + (level / 100 * 0.8)).tolist()  # 11.8V to 12.6V range
     }
 
-def simulate_system_metrics():
+def simulate_system_metrics(now):
     """Simulate realistic system metrics with variation"""
-    
-    elapsed = time.time() - start_time
+    n = SIM_DEVICES
+    elapsed = now - start_time
     
     # CPU usage varies with "load"
     base_cpu = 25
-    cpu_spike = math.sin(elapsed / 20) * 15  # Periodic spikes
-    cpu_usage = base_cpu + cpu_spike + random.uniform(-5, 5)
-    cpu_usage = max(5, min(95, cpu_usage))
+    cpu_spike = np.sin(elapsed / 20) * 15  # Periodic spikes
+    cpu_usage = base_cpu + cpu_spike + np.random.uniform(-5, 5, n)
+    np.clip(cpu_usage, 5, 95, out=cpu_usage)
     
     # Memory usage slowly increases
     memory_base = 2.1
     memory_growth = (elapsed / 3600) * 0.1  # Grows 0.1GB per hour
-    memory_used = memory_base + memory_growth + random.uniform(-0.05, 0.05)
+    memory_used = memory_base + memory_growth + np.random.uniform(-0.05, 0.05, n)
     memory_total = 4.0
     memory_percent = (memory_used / memory_total) * 100
     
     # Disk usage stays relatively stable
-    disk_used = 12.8 + random.uniform(-0.1, 0.1)
+    disk_used = 12.8 + np.random.uniform(-0.1, 0.1, n)
     disk_total = 32.0
     disk_percent = (disk_used / disk_total) * 100
     
-    # Network latency varies
-    if random.random() > 0.9:  # 10% chance of spike
-        latency = random.uniform(50, 200)
-        network_status = 'online'
-    else:
-        latency = random.uniform(10, 40)
-        network_status = 'online'
+    # Network latency varies, 10% chance of spike
+    latency = np.where(np.random.random(n) > 0.9,
+                       np.random.uniform(50, 200, n),
+                       np.random.uniform(10, 40, n))
     
     # CPU temperature correlates with usage
-    cpu_temp = 45 + (cpu_usage / 100 * 30) + random.uniform(-2, 2)
+    cpu_temp = 45 + (cpu_usage / 100 * 30) + np.random.uniform(-2, 2, n)
     
     # Uptime
-    uptime_hours = int(elapsed / 3600)
+    uptime_hours = (elapsed // 3600).astype(int)
     
     return {
-        'cpu_usage': round(cpu_usage, 1),
-        'cpu_temp': round(cpu_temp, 1),
-        'memory_used': round(memory_used, 2),
+        'cpu_usage': np.round(cpu_usage, 1).tolist(),
+        'cpu_temp': np.round(cpu_temp, 1).tolist(),
+        'memory_used': np.round(memory_used, 2).tolist(),
         'memory_total': round(memory_total, 2),
-        'memory_percent': round(memory_percent, 1),
-        'disk_used': round(disk_used, 2),
+        'memory_percent': np.round(memory_percent, 1).tolist(),
+        'disk_used': np.round(disk_used, 2).tolist(),
         'disk_total': round(disk_total, 2),
-        'disk_percent': round(disk_percent, 1),
-        'latency': round(latency, 1),
-        'network_status': network_status,
-        'uptime_hours': uptime_hours
+        'disk_percent': np.round(disk_percent, 1).tolist(),
+        'latency': np.round(latency, 1).tolist(),
+        'uptime_hours': uptime_hours.tolist()
     }
 
 def simulate_sync_status():
@@ -169,45 +158,95 @@ def dashboard():
     """Serve the dashboard"""
     return render_template('dashboard.html')
 
-@app.route('/api/health')
-def health():
-    """Return simulated health data matching the expected format"""
-    try:
-        system_metrics = simulate_system_metrics()
-        battery = simulate_battery_data()
-        gps = simulate_gps_data()
-        sync = simulate_sync_status()
-        
-        health_data = {
-            'device_name': 'RPi CM4 - Sensor System (SIMULATION)',
+def simulate_fleet_health():
+    """Simulate health data for every device in one vectorized pass"""
+    now = time.time()
+    system_metrics = simulate_system_metrics(now)
+    battery = simulate_battery_data(now)
+    gps = simulate_gps_data(now)
+    sync = simulate_sync_status()
+    
+    # Timestamp built directly rather than through strftime's format parser
+    t = _now()
+    timestamp = f"{t.year:04d}-{t.month:02d}-{t.day:02d} {t.hour:02d}:{t.minute:02d}:{t.second:02d}"
+    
+    fleet = []
+    for i in range(SIM_DEVICES):
+        fleet.append({
+            'device_name': 'RPi CM4 - Sensor System (SIMULATION)' if i == 0
+                           else f'RPi CM4 - Sensor System (SIMULATION {i})',
             
             # System metrics
-            'cpu_usage': system_metrics['cpu_usage'],
-            'cpu_temp': system_metrics['cpu_temp'],
-            'memory_used': system_metrics['memory_used'],
+            'cpu_usage': system_metrics['cpu_usage'][i],
+            'cpu_temp': system_metrics['cpu_temp'][i],
+            'memory_used': system_metrics['memory_used'][i],
             'memory_total': system_metrics['memory_total'],
-            'memory_percent': system_metrics['memory_percent'],
-            'disk_used': system_metrics['disk_used'],
+            'memory_percent': system_metrics['memory_percent'][i],
+            'disk_used': system_metrics['disk_used'][i],
             'disk_total': system_metrics['disk_total'],
-            'disk_percent': system_metrics['disk_percent'],
-            'latency': system_metrics['latency'],
-            'network_status': system_metrics['network_status'],
-            'uptime_hours': system_metrics['uptime_hours'],
+            'disk_percent': system_metrics['disk_percent'][i],
+            'latency': system_metrics['latency'][i],
+            'network_status': 'online',
+            'uptime_hours': system_metrics['uptime_hours'][i],
             
             # Sensor data
-            'battery': battery,
-            'gps': gps,
+            'battery': {
+                'level': battery['level'][i],
+                'status': battery['status'][i],
+                'voltage': battery['voltage'][i],
+                'available': True
+            },
+            'gps': {
+                'connected': True,
+                'fix': gps['fix'][i],
+                'satellites': gps['satellites'][i],
+                'latitude': gps['latitude'][i],
+                'longitude': gps['longitude'][i],
+                'altitude': gps['altitude'][i],
+                'available': True
+            },
             'sync': sync,
             'recording': recording_state,
             
             # Metadata
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
+            'timestamp': timestamp
+        })
         
-        return jsonify(health_data)
+    return fleet
+
+# A fleet pass is O(SIM_DEVICES), so it is done at most once per
+# FLEET_CACHE_TTL seconds and shared by /api/health and /api/fleet/health
+FLEET_CACHE_TTL = 1.0
+_fleet_cache = (0.0, None) # (simulated_at, fleet_list)
+
+def get_fleet_health():
+    """Cached simulate_fleet_health"""
+    global _fleet_cache
+    
+    now = time.monotonic()
+    simulated_at, fleet = _fleet_cache
+    if fleet is None or now - simulated_at >= FLEET_CACHE_TTL:
+        fleet = simulate_fleet_health()
+        _fleet_cache = (now, fleet)
+    return fleet
+
+@app.route('/api/health')
+def health():
+    """Return simulated health data matching the expected format"""
+    try:
+        return json_response(get_fleet_health()[0])
+        
+    except Exception as e:
+        return json_response({'error': str(e)}), 500
+
+@app.route('/api/fleet/health')
+def fleet_health():
+    """Return simulated health data for every simulated device"""
+    try:
+        return json_response({'devices': get_fleet_health()})
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return json_response({'error': str(e)}), 500
 
 @app.route('/api/toggle_recording', methods=['POST'])
 def toggle_recording():
@@ -215,7 +254,7 @@ def toggle_recording():
     global recording_state
     recording_state = not recording_state
     
-    return jsonify({
+    return json_response({
         'recording': recording_state,
         'message': 'Recording started' if recording_state else 'Recording stopped'
     })
@@ -237,7 +276,7 @@ def trigger_sync():
     
     threading.Thread(target=complete_sync, daemon=True).start()
     
-    return jsonify({
+    return json_response({
         'success': True,
         'message': 'Sync started',
         'sync': sync_state
@@ -254,9 +293,10 @@ if __name__ == '__main__':
     print("  • CPU/Memory usage varies realistically")
     print("  • Network latency has occasional spikes")
     print("  • Sync status changes based on recording state")
+    print(f"  • Simulating {SIM_DEVICES} device(s) (set SIM_DEVICES to change)")
     print("\nAccess dashboard at: http://localhost:5000")
     print("Press Ctrl+C to stop")
     print("=" * 60)
     print()
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Gunicorn settings for the EweGo Flask apps
+Usage: gunicorn -c gunicorn_conf.py                     (Pi app, via wsgi.py)
+       gunicorn -c gunicorn_conf.py dashboard_app:app
+"""
+
+import sys
+
+wsgi_app = 'wsgi:app'
+bind = '0.0.0.0:5000'
+
+# One worker: the Pi app owns the GPS serial port and the I2C battery monitor,
+# and the dashboard keeps its device state in process memory. Concurrency
+# comes from the thread pool instead. On the dashboard every open live-update
+# page holds one thread, capped at SSE_MAX_STREAMS (4) in dashboard_app.py, so
+# keep threads above that cap or nothing is left for normal requests.
+workers = 1
+worker_class = 'gthread'
+threads = 8
+
+# Hold idle keep-alive connections open between polls to reduce churn
+keepalive = 65
+
+# Restart a worker that has been unresponsive for this long
+timeout = 10
+
+def _app_module(worker):
+    # Module that defines the Flask app being served (e.g. pi_app)
+    return sys.modules.get(getattr(getattr(worker, 'wsgi', None), 'import_name', ''))
+
+def post_worker_init(worker):
+    # Start the app's background services (mDNS, GPS, pollers) inside the worker
+    module = _app_module(worker)
+    start_services = getattr(module, 'start_services', None)
+    if start_services is not None:
+        start_services()
+        
+def worker_exit(server, worker):
+    # Mirror the Ctrl+C cleanup done when running the app directly
+    module = _app_module(worker)
+    stop_services = getattr(module, 'stop_services', None)
+    if stop_services is not None:
+        stop_services()
@@ -0,0 +1,22 @@
+"""
+JSON responses for the EweGo Flask apps
+Uses orjson when it is installed, falling back to the standard library
+"""
+
+import json
+from flask import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj):
+    # Serialize to JSON bytes
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode('utf-8')
+
+def json_response(data, status=200):
+    # Drop-in replacement for jsonify
+    return Response(dumps(data), status=status, mimetype='application/json')
@@ -16,6 +16,9 @@ class EweGoMDNS:
         self.service_info = None
         self.port = port
         
+        # Local IP, looked up on first start and reused after that
+        self._local_ip = None
+        
         # Get device identifier
         if device_id is None:
             self.device_id = socket.gethostname()
@@ -36,7 +39,7 @@ class EweGoMDNS:
             self.zeroconf = Zeroconf()
             
             # Local Ip Address
-            local_ip = self._get_local_ip()
+            local_ip = self.local_ip
             
             # Creating service information
             self.service_info = ServiceInfo(
@@ -80,18 +83,32 @@ class EweGoMDNS:
         except Exception as e:
             print(f" Error ending mDNS: {e}")
     
+    @property
+    def local_ip(self):
+        # Cached local IP address. Only a real address is cached, so a lookup
+        # before the network is up is retried on the next call
+        if self._local_ip is None:
+            self._local_ip = self._get_local_ip()
+        return self._local_ip or "127.0.0.1" # Fallback to local host
+    
+    def refresh_local_ip(self):
+        # Look the local IP up again (e.g. after a DHCP renewal)
+        self._local_ip = None
+        return self.local_ip
+    
     def _get_local_ip(self):
         # Get local IP address
         
         try:
-            # Creating a temporary socket to determine IP 
+            # Creating a temporary socket to determine IP. Connecting a UDP
+            # socket only does a routing lookup, no packet is sent
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             s.connect(("8.8.8.8", 80)) # connect to public DNS
             local_ip = s.getsockname()[0]
             s.close()
             return local_ip
         except Exception:
-            return "127.0.0.1" # Fallback to local host
+            return None # No route yet
         
 if __name__ == "__main__":
     
@@ -11,12 +11,14 @@ import signal
 import board
 import adafruit_max1704x
 
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
-from datetime import datetime
+from flask import Flask, Response, render_template, request, redirect, url_for, flash
+from json_response import dumps, json_response
 import serial
-from pyubx2 import UBXReader # For GPS parsing
+from pyubx2 import UBXReader, UBXMessage, SET_LAYER_RAM, TXN_NONE # For GPS parsing/config
+from pynmeagps import NMEAReader
 from mdns_setup import EweGoMDNS #For mDNS service
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 
 app = Flask(__name__)
@@ -36,7 +38,7 @@ recording_lock = threading.Lock()
 
 
 # mDNS Service
-mdns_setup = None
+mdns_service = None
 
 # Global states
 recording_state = False
@@ -58,13 +60,13 @@ gps_data = {
 
 #GPS Globals
 gps_serial = None
-gps_reader = None
 gps_thread = None
 gps_running = False
 
 # Battery globals
 max17_sensor = None
 battery_initialized = False
+battery_thread = None
 
 # ============================================================================
 # BATTERY MONITORING - MAX17048
@@ -89,16 +91,77 @@ def init_battery():
 
 
 
+# Battery level barely moves, so it is sampled every BATTERY_SAMPLE_INTERVAL
+# seconds in the background and requests never touch the I2C bus. A missing
+# monitor is retried with backoff up to BATTERY_RETRY_MAX_INTERVAL
+BATTERY_SAMPLE_INTERVAL = 10
+BATTERY_RETRY_MAX_INTERVAL = 300
+
+# Latest reading, replaced wholesale by the sampler thread
+_battery_state = {
+    'level': 0,
+    'status': 'unavailable',
+    'voltage': 0.0,
+    'available': False
+}
+
+def start_battery_sampler():
+    # Start the battery sampling thread once
+    global battery_thread
+    
+    if battery_thread is None:
+        battery_thread = threading.Thread(target=battery_read_threading, daemon=True)
+        battery_thread.start()
+
+def init_battery_state():
+    # Bring up the battery monitor and take a first sample, so the state is
+    # filled before the sampler's first cycle
+    global _battery_state
+    
+    if init_battery():
+        _battery_state = read_battery_level()
+
+def battery_read_threading():
+    # Continously samples the battery monitor
+    global _battery_state
+    
+    retry_interval = BATTERY_SAMPLE_INTERVAL
+    
+    while True:
+        if battery_initialized or init_battery():
+            _battery_state = read_battery_level()
+            retry_interval = BATTERY_SAMPLE_INTERVAL
+            time.sleep(BATTERY_SAMPLE_INTERVAL)
+        else:
+            # No monitor on the bus, wait longer before each retry
+            time.sleep(retry_interval)
+            retry_interval = min(retry_interval * 2, BATTERY_RETRY_MAX_INTERVAL)
+
 def get_battery_level():
+    # Latest sampled battery level
+    return _battery_state
+
+# MAX17048 VCELL (0x02) and SOC (0x04) are adjacent 16-bit registers, so both
+# come back in one 4-byte read starting at VCELL
+MAX17048_VCELL_REG = 0x02
+_battery_reg = bytes([MAX17048_VCELL_REG])
+_battery_buf = bytearray(4)
+
+def read_battery_registers():
+    # Returns (percent, voltage) from a single I2C transaction
+    with max17_sensor.i2c_device as i2c:
+        i2c.write_then_readinto(_battery_reg, _battery_buf)
+    b = _battery_buf
+    voltage = ((b[0] << 8) | b[1]) * 78.125e-6 # 78.125 uV per LSB
+    percent = b[2] + b[3] / 256                # 1/256 % per LSB
+    return percent, voltage
+
+def read_battery_level():
     #Get battery level
     
     global max17_sensor, battery_initialized
     
-    #Initialize battery on the first call
-    if not battery_initialized:
-        init_battery()
-        
-    # No battery - return error info
+    # No battery - return error info. Initialization is retried by the sampler
     if not battery_initialized or max17_sensor is None:
         return{
             'level': 0,
@@ -108,8 +171,7 @@ def get_battery_level():
         }
     try:
         # Read from battery monitor
-        battery_percent = max17_sensor.cell_percentage
-        battery_voltage = max17_sensor.cell_voltage
+        battery_percent, battery_voltage = read_battery_registers()
         
         # Charging status
         if battery_percent >= 99 and battery_voltage >= 4.15:
@@ -140,16 +202,50 @@ def get_battery_level():
 # GPS MONITORING - ZED-X20P
 # ============================================================================
 
-def init_gps(port='/dev/ttyACM0', baudrate=38400):
+# USB serial ports a GPS receiver could be on, found once at startup
+# (USB CDC first since the ZED-X20P enumerates as ttyACM). On-board UARTs
+# (ttyAMA*) are often Bluetooth or the console, so they are never picked
+# automatically; set GPS_PORT to use one
+GPS_PORT = os.environ.get('GPS_PORT')
+_gps_candidate_paths = (sorted(glob.glob('/dev/ttyACM*'))
+                        + sorted(glob.glob('/dev/ttyUSB*')))
+
+# Receiver output: NMEA off, UBX NAV-PVT once per navigation solution, on both
+# USB and UART1. NAV-PVT carries everything the dashboard shows, so every other
+# sentence is wasted link bandwidth and parser time
+GPS_OUTPUT_CONFIG = [
+    ('CFG_USBOUTPROT_NMEA', 0),
+    ('CFG_USBOUTPROT_UBX', 1),
+    ('CFG_MSGOUT_UBX_NAV_PVT_USB', 1),
+    ('CFG_UART1OUTPROT_NMEA', 0),
+    ('CFG_UART1OUTPROT_UBX', 1),
+    ('CFG_MSGOUT_UBX_NAV_PVT_UART1', 1),
+]
+
+def configure_gps_output(gps_port):
+    # Send CFG-VALSET to the RAM layer only, so a power cycle restores the
+    # receiver's saved configuration
+    msg = UBXMessage.config_set(SET_LAYER_RAM, TXN_NONE, GPS_OUTPUT_CONFIG)
+    gps_port.write(msg.serialize())
+
+def init_gps(port=None, baudrate=38400):
 #Initialize GPS serial connection
 
-    global gps_serial,gps_reader, gps_thread, gps_running
-    try:
-        # Opening the serial connection to GPS
-        gps_serial = serial.Serial(port, baudrate, timeout=1)
+    global gps_serial, gps_thread, gps_running
+    
+    # Default to GPS_PORT, then the first USB serial port found at startup
+    if port is None:
+        port = GPS_PORT
+    if port is None:
+        if not _gps_candidate_paths:
+            print("GPS initilization error: no serial ports found")
+            return False
+        port = _gps_candidate_paths[0]
         
-        # UBX Reader, handles UBX and NMEA messages
-        gps_reader =UBXReader(gps_serial, protfilter=7)
+    try:
+        # Opening the serial connection to GPS. Reads block for up to the
+        # timeout, which is also how quickly the reader notices gps_running
+        gps_serial = serial.Serial(port, baudrate, timeout=0.2)
         
         #Start GPS reading thread
         gps_running=True
@@ -163,132 +259,258 @@ def init_gps(port='/dev/ttyACM0', baudrate=38400):
         print(f"GPS initilization error: {e}")
         return False
     
+UBX_SYNC = b'\xb5\x62'
+
+# NAV-PVT has a 92 byte payload. A length field above this is taken as a false
+# sync or corruption rather than waited on
+UBX_MAX_PAYLOAD = 1024
+
+# An NMEA sentence is at most 82 bytes, anything longer is noise
+NMEA_MAX_LENGTH = 82
+
+def _gps_frame_end(buf):
+    # Drop noise off the front of buf until it starts with a plausible UBX frame
+    # or NMEA sentence and return where that frame ends, None until it's complete
+    while buf:
+        ubx_start = buf.find(UBX_SYNC)
+        nmea_start = buf.find(b'$')
+        starts = [i for i in (ubx_start, nmea_start) if i >= 0]
+        
+        if not starts:
+            # Nothing to sync on, keep a trailing half sync word for the next read
+            del buf[:-1 if buf[-1] == UBX_SYNC[0] else len(buf)]
+            return None
+        
+        # Drop any noise before the frame
+        del buf[:min(starts)]
+        
+        if buf.startswith(UBX_SYNC):
+            # sync(2) class(1) id(1) length(2) payload checksum(2)
+            if len(buf) < 6:
+                return None
+            length = buf[4] | (buf[5] << 8)
+            if length > UBX_MAX_PAYLOAD:
+                del buf[:1]
+                continue
+            end = 8 + length
+        else:
+            end = buf.find(b'\r\n', 0, NMEA_MAX_LENGTH + 2) + 2
+            if end < 2:
+                if len(buf) >= NMEA_MAX_LENGTH + 2:
+                    del buf[:1]
+                    continue
+                return None
+        
+        return end if len(buf) >= end else None
+    return None
+
+def _parse_gps_frame(frame):
+    # Parse a frame found by _gps_frame_end, checksums are validated by the parsers
+    if frame.startswith(UBX_SYNC):
+        return UBXReader.parse(frame)
+    return NMEAReader.parse(frame)
+
+def _next_gps_message(buf):
+    # Pop and return the next message that parses, None until one has arrived.
+    # A frame that doesn't parse was a false sync or is corrupt, so only its first
+    # byte is dropped and the rest rescanned, it may hold real frames
+    while (end := _gps_frame_end(buf)) is not None:
+        try:
+            parsed_data = _parse_gps_frame(bytes(buf[:end]))
+        except Exception:
+            parsed_data = None
+        
+        if parsed_data:
+            del buf[:end]
+            return parsed_data
+        del buf[:1]
+    return None
+
 def gps_read_threading():
     # Contiously parses through GPS messages
-    global gps_data, gps_reader, gps_running
+    global gps_running
+    
+    buf = bytearray()
+    configured = False
     
     while gps_running:
         try:
-            if gps_reader:
-                # Read the next message from GPS
-                raw_data, parsed_data = gps_reader.read()
+            # Take everything the port has buffered in one read. With nothing
+            # buffered, block in the kernel until a byte arrives or the timeout
+            buf.extend(gps_serial.read(max(1, gps_serial.in_waiting)))
+            
+            while (parsed_data := _next_gps_message(buf)) is not None:
+                # Trim output to NAV-PVT, but only once a checksummed message
+                # shows a receiver is on this port. Receivers that reject this
+                # keep sending NMEA, which the NMEA handlers still cover
+                if not configured:
+                    configured = True
+                    try:
+                        configure_gps_output(gps_serial)
+                    except Exception as e:
+                        print(f"GPS output configuration failed: {e}")
                 
-                if parsed_data:
-                    # Update GPS data biased on message type
-                    process_gps_message(parsed_data)
-                    gps_data['connected']= True
-                    gps_data['available'] = True
-                    gps_data['last_update'] = time.time()
+                # Update GPS data biased on message type
+                process_gps_message(parsed_data)
                     
         except Exception as e:
-            if 'timeout' not in str(e).lower():
-                print(f"GPS read error: {e}")
+            # Brief backoff so a failing port doesn't spin
+            print(f"GPS read error: {e}")
             time.sleep(0.1)
-            
-        # Small delay to prevent CPU spinning
-        time.sleep(0.01)
         
-def process_gps_message(msg):
+# UBX NAV-PVT (Position Velocity Time) - Most comprehensive message
+def _handle_nav_pvt(msg, d):
+    # Hot path, so direct attribute access and multiply by the reciprocal.
+    # pyubx2 already scales lat/lon to degrees
+    try:
+        d['latitude'] = msg.lat
+        d['longitude'] = msg.lon
+        d['altitude'] = msg.hMSL * 0.001  # Convert to meters
+        d['satellites'] = msg.numSV
+        #d['speed'] = msg.gSpeed * 0.001  # Convert to m/s
+        #d['heading'] = msg.headMot  # Already degrees
+        fix_type = msg.fixType
+    except AttributeError:
+        # Truncated message, keep the last good values
+        return
+    
+    # Determine fix type
+    if fix_type == 0:
+        d['fix'] = 'no fix'
+    elif fix_type == 2:
+        d['fix'] = '2D'
+    elif fix_type == 3:
+        d['fix'] = '3D'
+    elif fix_type >= 4:
+        d['fix'] = '3D+RTK'  # RTK fix
+        
+# UBX NAV-SAT (Satellite Information)
+def _handle_nav_sat(msg, d):
+    d['satellites'] = getattr(msg, 'numSvs', 0)
     
-    # Process incoming GPS message and update global state
+# UBX NAV-DOP (Dilution of Precision)
+#def _handle_nav_dop(msg, d):
+    #d['hdop'] = getattr(msg, 'hDOP', 9999) / 100.0
+    
+# NMEA GGA (Global Positioning System Fix Data)
+def _handle_gga(msg, d):
+    try:
+        lat = getattr(msg, 'lat', 0.0)
+        lon = getattr(msg, 'lon', 0.0)
+        alt = getattr(msg, 'alt', 0.0)
+        
+        # Convert to float, handle empty strings
+        d['latitude'] = float(lat) if lat != '' else 0.0
+        d['longitude'] = float(lon) if lon != '' else 0.0
+        d['altitude'] = float(alt) if alt != '' else 0.0
+        d['satellites'] = int(getattr(msg, 'numSV', 0))
+    except (ValueError, TypeError) as e:
+        # Skip invalid data
+        pass
+    
+    # NMEA quality indicator
+    quality = getattr(msg, 'quality', 0)
+    if quality == 0:
+        d['fix'] = 'no fix'
+    elif quality == 1:
+        d['fix'] = '3D'
+    elif quality in [4, 5]:
+        d['fix'] = '3D+RTK'
+        
+# NMEA RMC (Recommended Minimum)
+def _handle_rmc(msg, d):
+    try:
+        lat = getattr(msg, 'lat', 0.0)
+        lon = getattr(msg, 'lon', 0.0)
+        
+        # Convert to float, handle empty strings
+        d['latitude'] = float(lat) if lat != '' else 0.0
+        d['longitude'] = float(lon) if lon != '' else 0.0
+    except (ValueError, TypeError) as e:
+        pass
+    #d['speed'] = getattr(msg, 'spd', 0.0) * 0.514444  # knots to m/s
+    #d['heading'] = getattr(msg, 'cog', 0.0)
+    
+# Message identity -> handler, matched exactly. NMEA identities carry a
+# talker prefix (e.g. 'GNGGA'), so every talker the receiver can use gets an entry
+_NMEA_TALKERS = ('GP', 'GN', 'GL', 'GA', 'GB', 'GQ')
+
+_GPS_HANDLERS = {
+    'NAV-PVT': _handle_nav_pvt,
+    'NAV-SAT': _handle_nav_sat,
+}
+for _talker in _NMEA_TALKERS:
+    _GPS_HANDLERS[_talker + 'GGA'] = _handle_gga
+    _GPS_HANDLERS[_talker + 'RMC'] = _handle_rmc
+
+def process_gps_message(msg):
     
+    # Process incoming GPS message and update global state. Handlers fill in a
+    # copy that then replaces gps_data in one assignment, so readers always see
+    # a complete position/fix without taking a lock. The reader thread is the
+    # only writer
     global gps_data
+    msg_id = None
+    new = dict(gps_data)
     
     try:
-        # Get message identity (e.g., 'NAV-PVT', 'GGA', etc.)
+        # Get message identity (e.g., 'NAV-PVT', 'GNGGA', etc.)
         msg_id = str(msg.identity) if hasattr(msg, 'identity') else str(msg.msgID)
         
-        # UBX NAV-PVT (Position Velocity Time) - Most comprehensive message
-        if 'NAV-PVT' in msg_id:
-            gps_data['latitude'] = getattr(msg, 'lat', 0) / 1e7  # Convert to degrees
-            gps_data['longitude'] = getattr(msg, 'lon', 0) / 1e7
-            gps_data['altitude'] = getattr(msg, 'hMSL', 0) / 1000.0  # Convert to meters
-            gps_data['satellites'] = getattr(msg, 'numSV', 0)
-            #gps_data['speed'] = getattr(msg, 'gSpeed', 0) / 1000.0  # Convert to m/s
-            #gps_data['heading'] = getattr(msg, 'headMot', 0) / 1e5
-            
-            # Determine fix type
-            fix_type = getattr(msg, 'fixType', 0)
-            if fix_type == 0:
-                gps_data['fix'] = 'no fix'
-            elif fix_type == 2:
-                gps_data['fix'] = '2D'
-            elif fix_type == 3:
-                gps_data['fix'] = '3D'
-            elif fix_type >= 4:
-                gps_data['fix'] = '3D+RTK'  # RTK fix
-                
-        # UBX NAV-SAT (Satellite Information)
-        elif 'NAV-SAT' in msg_id:
-            gps_data['satellites'] = getattr(msg, 'numSvs', 0)
-            
-        # UBX NAV-DOP (Dilution of Precision)
-        #elif 'NAV-DOP' in msg_id:
-            #gps_data['hdop'] = getattr(msg, 'hDOP', 9999) / 100.0
-            
-        # NMEA GGA (Global Positioning System Fix Data)
-        elif 'GGA' in msg_id:
-            try:
-                lat = getattr(msg, 'lat', 0.0)
-                lon = getattr(msg, 'lon', 0.0)
-                alt = getattr(msg, 'alt', 0.0)
-                
-                # Convert to float, handle empty strings
-                gps_data['latitude'] = float(lat) if lat != '' else 0.0
-                gps_data['longitude'] = float(lon) if lon != '' else 0.0
-                gps_data['altitude'] = float(alt) if alt != '' else 0.0
-                gps_data['satellites'] = int(getattr(msg, 'numSV', 0))
-            except (ValueError, TypeError) as e:
-                # Skip invalid data
-                pass
-            
-            # NMEA quality indicator
-            quality = getattr(msg, 'quality', 0)
-            if quality == 0:
-                gps_data['fix'] = 'no fix'
-            elif quality == 1:
-                gps_data['fix'] = '3D'
-            elif quality in [4, 5]:
-                gps_data['fix'] = '3D+RTK'
-                
-        # NMEA RMC (Recommended Minimum)
-        elif 'RMC' in msg_id:
-            try:
-                lat = getattr(msg, 'lat', 0.0)
-                lon = getattr(msg, 'lon', 0.0)
-                
-                # Convert to float, handle empty strings
-                gps_data['latitude'] = float(lat) if lat != '' else 0.0
-                gps_data['longitude'] = float(lon) if lon != '' else 0.0
-            except (ValueError, TypeError) as e:
-                pass
-            #gps_data['speed'] = getattr(msg, 'spd', 0.0) * 0.514444  # knots to m/s
-            #gps_data['heading'] = getattr(msg, 'cog', 0.0)
+        handler = _GPS_HANDLERS.get(msg_id)
+        if handler:
+            handler(msg, new)
             
     except Exception as e:
         print(f"Error processing GPS message {msg_id}: {e}")
+    
+    new['connected'] = True
+    new['available'] = True
+    new['last_update'] = time.time()
+    gps_data = new
         
+# GPS position actually changes, so it is only reused for GPS_CACHE_TTL seconds
+GPS_CACHE_TTL = 0.5
+_gps_status_cache = (0.0, None) # (read_at, gps_dict)
+
 def get_gps_status():
+    # Cached GPS status
+    global _gps_status_cache
+    
+    now = time.monotonic()
+    read_at, gps = _gps_status_cache
+    if gps is not None and now - read_at < GPS_CACHE_TTL:
+        return gps
+    
+    gps = read_gps_status()
+    _gps_status_cache = (now, gps)
+    return gps
+
+def read_gps_status():
     #Get GPS status
     
-    global gps_data
+    # One reference, the reader thread may swap in a new dict meanwhile
+    gps = gps_data
+    connected = gps['connected']
+    fix = gps['fix']
     
-    # Check if GPS data is older than 5 seconds, then update
-    if gps_data['last_update']:
-        age = time.time() - gps_data['last_update']
+    # Report GPS data older than 5 seconds as lost. Only the reader thread
+    # writes gps_data, the next message brings it back
+    if gps['last_update']:
+        age = time.time() - gps['last_update']
         if age > 5:
-            gps_data['connected'] = False
-            gps_data['fix'] = 'no fix'
+            connected = False
+            fix = 'no fix'
         
             
     return {
         # Real data
-        'connected': gps_data['connected'],
-        'fix': gps_data['fix'],
-        'latitude': round(gps_data['latitude'], 6),
-        'longitude': round(gps_data['longitude'], 6),
-        'altitude': round(gps_data['altitude'], 2),
-        'available': gps_data['available']  
+        'connected': connected,
+        'fix': fix,
+        'latitude': round(gps['latitude'], 6),
+        'longitude': round(gps['longitude'], 6),
+        'altitude': round(gps['altitude'], 2),
+        'available': gps['available']  
     }
 
 # ============================================================================
@@ -304,15 +526,15 @@ def get_gps_status():
         recording_path = '/home/{user}/recordings/'
         
         if os.path.exists(recording_path):
-            # Counting files needed to be synced
-            all_files = [f for f in os.listdir(recording_path)
-                         if os.path.isfile(os.path.join(recording_path, f))
-                         and not f.endswith('.synced')]
-            sync_state['pending_files']= len(all_files)
+            # Counting files needed to be synced, DirEntry gets the file type
+            # from the directory listing so there is no stat per file
+            with os.scandir(recording_path) as entries:
+                sync_state['pending_files'] = sum(1 for e in entries
+                                                  if e.is_file(follow_symlinks=False)
+                                                  and not e.name.endswith('.synced'))
             
-            # If network stable, files will sync
-            try:
-                subprocess.check_output(['ping', '-c', '1', '8.8.8.8'], timeout=2)
+            # If network stable, files will sync (uses the background network probe)
+            if _net_state['status'] == 'online':
                 if sync_state['pending_files'] > 0:
                     # Reaming synching as long as there are files
                     sync_state['status'] = 'pending'
@@ -320,8 +542,8 @@ def get_gps_status():
                     # Complete sync once now files are left
                     sync_state['status'] = 'synced'
                     if sync_state['last_sync'] is None:
-                        sync_state['last_sync'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            except:
+                        sync_state['last_sync'] = wall_timestamp()
+            else:
                 # Can't sync while offline
                 sync_state['status'] = 'offline'
         else:
@@ -437,36 +659,140 @@ def is_recording():
 # ============================================================================
 # SYSTEM METRICS
 # ============================================================================
+
+# Network latency is measured as a TCP handshake to public DNS by a background
+# thread, so a dead uplink never stalls /api/health. Probes run every
+# NET_PROBE_INTERVAL seconds and back off up to NET_PROBE_MAX_INTERVAL on failure
+LATENCY_TARGET = ('8.8.8.8', 53)
+NET_PROBE_INTERVAL = 5
+NET_PROBE_MAX_INTERVAL = 30
+net_thread = None
+
+# Latest probe result, replaced wholesale by the probe thread
+_net_state = {'latency': 0, 'status': 'unknown'}
+
+def probe_latency():
+    # Returns (latency_ms, network_status) from one TCP handshake
+    try:
+        start = time.perf_counter()
+        with socket.create_connection(LATENCY_TARGET, timeout=1):
+            latency = (time.perf_counter() - start) * 1000
+        return latency, 'online'
+    except OSError:
+        return 0, 'offline'
+
+def start_network_monitor():
+    # Start the network probe thread once
+    global net_thread
+    
+    if net_thread is None:
+        net_thread = threading.Thread(target=net_read_threading, daemon=True)
+        net_thread.start()
+
+def net_read_threading():
+    # Continously probes the uplink
+    global _net_state
+    
+    interval = NET_PROBE_INTERVAL
+    while True:
+        started = time.monotonic()
+        latency, network_status = probe_latency()
+        _net_state = {'latency': latency, 'status': network_status}
+        
+        # Back off while offline (5s -> 10s -> 20s -> 30s), reset once back online
+        if network_status == 'online':
+            interval = NET_PROBE_INTERVAL
+        else:
+            interval = min(interval * 2, NET_PROBE_MAX_INTERVAL)
+            
+        # Schedule from the start of the probe so a slow probe doesn't stretch the cadence
+        time.sleep(max(0, started + interval - time.monotonic()))
+
+def measure_latency():
+    # Latest (latency_ms, network_status) from the probe thread
+    state = _net_state
+    return state['latency'], state['status']
+
+def get_uptime_hours():
+    # System uptime in whole hours. CLOCK_BOOTTIME is the clock /proc/uptime
+    # reports, read here without opening a file
+    return int(time.clock_gettime(time.CLOCK_BOOTTIME)) // 3600
+
+# Metrics are sampled at most once per METRICS_CACHE_TTL, so concurrent pollers
+# (browser, dashboard, scanner) share one sample. The lock makes sure only one
+# request thread collects a new sample while the others wait for it. Each sample
+# is encoded to JSON once, so polls within the TTL just send the cached bytes.
+METRICS_CACHE_TTL = 1.0
+_metrics_cache = (0.0, None, b'') # (sampled_at, metrics_dict, metrics_json)
+_metrics_lock = threading.Lock()
+
+def _metrics_sample():
+    # Cached (metrics_dict, metrics_json)
+    global _metrics_cache
+    
+    sampled_at, metrics, payload = _metrics_cache
+    if metrics is not None and time.monotonic() - sampled_at < METRICS_CACHE_TTL:
+        return metrics, payload
+    
+    with _metrics_lock:
+        # Another thread may have refreshed the sample while we waited
+        now = time.monotonic()
+        sampled_at, metrics, payload = _metrics_cache
+        if metrics is not None and now - sampled_at < METRICS_CACHE_TTL:
+            return metrics, payload
+        
+        metrics = collect_system_metrics()
+        payload = dumps(metrics)
+        _metrics_cache = (now, metrics, payload)
+        return metrics, payload
+
 def get_system_metrics():
+    # Cached comphrensive system status
+    return _metrics_sample()[0]
+
+def get_health_json():
+    # Cached system status, already encoded for /api/health
+    return _metrics_sample()[1]
+
+# Bound once, called on every metrics sample
+_virtual_memory = psutil.virtual_memory
+
+# Local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per wall-clock second
+_ts_cache = (0, '') # (epoch_second, timestamp)
+
+def wall_timestamp():
+    # Current local timestamp string
+    global _ts_cache
+    
+    now = int(time.time())
+    second, timestamp = _ts_cache
+    if now != second:
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        _ts_cache = (now, timestamp)
+    return timestamp
+
+def collect_system_metrics():
     # Comphrensive system status
     
     # Memory Usage
-    memory = psutil.virtual_memory()
+    memory = _virtual_memory()
     memory_used_gb = memory.used / (1024**3)
     memory_total_gb = memory.total / (1024**3)
     memory_percent = memory.percent
     
     # Uptime - find how long the system has been running
-    try:
-        uptime_sec = int(subprocess.check_output(['cat', '/proc/uptime']).decode().split()[0].split('.')[0])
-        uptime_hrs = uptime_sec // 3600
-    except:
-        uptime_hrs = 0
+    uptime_hrs = get_uptime_hours()
         
     # Network Latency
-    try:
-        ping = subprocess.check_output(['ping', '-c', '1', '8.8.8.8'], timeout=2)
-        latency = float(ping.decode().split('time=')[1].split(' ms')[0])
-        network_status = 'online'
-    except:
-        latency = 0
-        network_status='offline'
+    latency, network_status = measure_latency()
         
     # Other monitored data
     battery = get_battery_level()
     gps = get_gps_status()
     """sync = check_sync_status()"""
     
+    timestamp = wall_timestamp()
+    
     return {
         'device_name': DEVICE_ID,
         'memory_used': round(memory_used_gb, 2),
@@ -479,7 +805,7 @@ def get_system_metrics():
         'battery': battery,
         'gps': gps,
         #'sync': sync,
-        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'timestamp': timestamp
     }
     
 # ============================================================================
@@ -507,11 +833,15 @@ def dashboard():
 @app.route('/api/health')
 def health():
     try:
-        health_data = get_system_metrics()
-        return jsonify(health_data)
+        # Metrics are resampled once a second, so clients may reuse a response
+        # for that long and revalidate with If-None-Match after (304 if unchanged)
+        resp = Response(get_health_json(), mimetype='application/json')
+        resp.cache_control.max_age = METRICS_CACHE_TTL
+        resp.add_etag()
+        return resp.make_conditional(request)
     except Exception as e:
         print(f"Health API error: {e}")
-        return jsonify({'error' : str(e)}), 500
+        return json_response({'error' : str(e)}), 500
     
 # Start the recording of the devices from dashboard
 @app.route('/api/toggle_recording', methods=['POST'])
@@ -523,7 +853,7 @@ def toggle_recording():
     if recording_state or is_recording():
         # Stop recording
         success, message = stop_recording()
-        return jsonify({
+        return json_response({
             'recording': recording_state,
             'success': success,
             'message': message
@@ -532,7 +862,7 @@ def toggle_recording():
     else:
         # Start recording
         success, message = start_recording()
-        return jsonify({
+        return json_response({
             'recording': recording_state,
             'success': success,
             'message': message
@@ -543,7 +873,7 @@ def start_recording_api():
     
     #Start recording process from API
     success, message = start_recording()
-    return jsonify({
+    return json_response({
         'recording': recording_state,
         'success': success,
         'message': message
@@ -554,7 +884,7 @@ def stop_recording_api():
     
     #Stop recording process from API
     success, message = stop_recording()
-    return jsonify({
+    return json_response({
         'recording': recording_state,
         'success': success,
         'message': message
@@ -564,7 +894,7 @@ def stop_recording_api():
 def recording_status_api():
     
     # Get current recording status
-    return jsonify({
+    return json_response({
         'recording': is_recording(),
         'process_id': recording_process.pid if recording_process else None
     })
@@ -574,27 +904,56 @@ def recording_status_api():
 @app.route('/api/sync', methods=['POST'])
 def trigger_sync():"""
 
-if __name__ == '__main__':
-    print("=" * 60)
-    print("EweGo Pi App Starting...")
-    print("=" * 60)
-    print(f"\nDevice ID: {DEVICE_ID}")
-    print(f"Device Name: {DEVICE_NAME}")
+# ============================================================================
+# SERVICE STARTUP
+# ============================================================================
+
+def start_services():
+    # Start mDNS advertising and GPS reader, called once per serving process
+    global mdns_service
+    
+    # Start network latency probing first so its first probe overlaps the rest
+    print("\nStarting network monitor...")
+    start_network_monitor()
     
-    # Initialize mDNS service
-    print("\nStarting mDNS service...")
+    # mDNS, GPS and battery bring-up are independent and each waits on I/O,
+    # so run them side by side
+    print("\nStarting mDNS service, GPS and battery monitor...")
     mdns_service = EweGoMDNS(device_id=DEVICE_ID, port=5000)
-    if mdns_service.start():
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        mdns_started = pool.submit(mdns_service.start)
+        gps_started = pool.submit(init_gps)
+        pool.submit(init_battery_state)
+    
+    if mdns_started.result():
         print(f"Device discoverable at: http://{DEVICE_ID}.local:5000")
     else:
         print("mDNS failed - device only accessible by IP address")
     
-    # Initialize GPS
-    print("\nInitializing GPS...")
-    if init_gps():
+    if gps_started.result():
         print("GPS initialized (waiting for fix...)")
     else:
         print("GPS initialization failed")
+        
+    # Start battery sampling
+    start_battery_sampler()
+    
+    # Warm the metrics cache so the first /api/health is served from it
+    get_health_json()
+        
+def stop_services():
+    # Clean shutdown of background services
+    if mdns_service:
+        mdns_service.stop()
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("EweGo Pi App Starting...")
+    print("=" * 60)
+    print(f"\nDevice ID: {DEVICE_ID}")
+    print(f"Device Name: {DEVICE_NAME}")
+    
+    start_services()
     
     """# Create recordings directory
     os.makedirs('/home/pi/recordings', exist_ok=True)
@@ -614,6 +973,5 @@ if __name__ == '__main__':
         print("\n\nShutting down...")
     finally:
         # Clean shutdown
-        if mdns_service:
-            mdns_service.stop()
+        stop_services()
         print("✅ Shutdown complete")
\ No newline at end of file
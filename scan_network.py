@@ -5,40 +5,130 @@ Works in WSL where mDNS discovery doesn't work
 Scans network for devices responding to /api/health endpoint
 """
 
-import requests
+import aiohttp
+import asyncio
+import errno
+import psutil
+import selectors
 import socket
-import subprocess
-import concurrent.futures
+import time
 from ipaddress import IPv4Network
 
+def _outbound_ip():
+    # Address the kernel would route public traffic from. Connecting a UDP
+    # socket only does the route lookup, no packet is sent
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        return s.getsockname()[0]
+    finally:
+        s.close()
+
 def get_local_network():
     """
     Get the local network range to scan
     
+    Reads interface addresses in-process with psutil, preferring the interface
+    that carries the default route. Subnets larger than /24 are narrowed to the
+    /24 around this machine's address to keep the scan short.
+    
     Returns:
         str: Network in CIDR notation (e.g., '192.168.1.0/24')
     """
     try:
-        # Get default gateway
-        result = subprocess.run(['ip', 'route'], capture_output=True, text=True)
-        for line in result.stdout.split('\n'):
-            if 'default' in line:
-                gateway = line.split()[2]
-                # Extract network portion (assume /24)
-                network_parts = gateway.split('.')
-                network = f"{'.'.join(network_parts[:3])}.0/24"
-                return network
-    except:
+        try:
+            preferred_ip = _outbound_ip()
+        except OSError:
+            preferred_ip = None
+            
+        stats = psutil.net_if_stats()
+        candidates = []
+        for name, addrs in psutil.net_if_addrs().items():
+            if name in stats and not stats[name].isup:
+                continue
+            for addr in addrs:
+                if addr.family == socket.AF_INET and addr.netmask and not addr.address.startswith('127.'):
+                    candidates.append((addr.address, addr.netmask))
+                    
+        # Default-route interface first, otherwise the first one that is up
+        candidates.sort(key=lambda c: c[0] != preferred_ip)
+        if candidates:
+            address, netmask = candidates[0]
+            network = IPv4Network((address, netmask), strict=False)
+            if network.prefixlen < 24:
+                network = IPv4Network((address, 24), strict=False)
+            return str(network)
+    except Exception:
         pass
     
     # Fallback: common private networks
     return '192.168.1.0/24'
 
-def check_device(ip):
+# Probes in flight at once. Each one is a coroutine on a single event loop,
+# so this can be far higher than a thread pool could afford
+DEFAULT_MAX_WORKERS = 256
+
+# How long the connect sweep waits for hosts to accept on port 5000
+CONNECT_TIMEOUT = 0.5
+
+def find_open_hosts(hosts, port=5000, timeout=CONNECT_TIMEOUT, batch_size=DEFAULT_MAX_WORKERS):
+    """
+    Find which hosts accept TCP connections on a port
+    
+    Starts a non-blocking connect to every host in a batch and waits on all of
+    them at once, so dead addresses cost one shared timeout instead of an HTTP
+    request each.
+    
+    Args:
+        hosts: List of IP address strings
+        port: TCP port to try
+        timeout: Seconds to wait for each batch of connects
+        batch_size: Sockets open at once (keeps below the file descriptor limit)
+    
+    Returns:
+        list: Hosts that accepted the connection
+    """
+    open_hosts = []
+    
+    for start in range(0, len(hosts), batch_size):
+        selector = selectors.DefaultSelector()
+        try:
+            # Start every connect in the batch
+            for ip in hosts[start:start + batch_size]:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                err = sock.connect_ex((ip, port))
+                if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                    selector.register(sock, selectors.EVENT_WRITE, ip)
+                else:
+                    sock.close()
+                    
+            # Writable means the connect finished, SO_ERROR says if it succeeded
+            deadline = time.monotonic() + timeout
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in selector.select(remaining):
+                    sock = key.fileobj
+                    selector.unregister(sock)
+                    if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                        open_hosts.append(key.data)
+                    sock.close()
+        finally:
+            # Anything still pending timed out
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()
+            selector.close()
+            
+    return open_hosts
+
+async def check_device(session, ip):
     """
     Check if an IP is an EweGoUI device
     
     Args:
+        session: aiohttp.ClientSession to send the request on
         ip: IP address to check
     
     Returns:
@@ -47,38 +137,53 @@ def check_device(ip):
     try:
         # Try to connect to the health API
         url = f"http://{ip}:5000/api/health"
-        response = requests.get(url, timeout=1)
-        
-        if response.status_code == 200:
-            data = response.json()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=1)) as response:
             
-            # Check if it's an EweGoUI device by looking for expected fields
-            if 'device_id' in data or 'device_name' in data:
-                return {
-                    'ip': ip,
-                    'device_id': data.get('device_id', 'unknown'),
-                    'device_name': data.get('device_name', 'Unknown Device'),
-                    'battery': data.get('battery', {}).get('level', 'N/A'),
-                    'gps': data.get('gps', {}).get('fix', 'unknown'),
-                    'recording': data.get('recording', False),
-                    'network_status': data.get('network_status', 'unknown')
-                }
-    except:
+            if response.status == 200:
+                data = await response.json()
+                
+                # Check if it's an EweGoUI device by looking for expected fields
+                if 'device_id' in data or 'device_name' in data:
+                    return {
+                        'ip': ip,
+                        'device_id': data.get('device_id', 'unknown'),
+                        'device_name': data.get('device_name', 'Unknown Device'),
+                        'battery': data.get('battery', {}).get('level', 'N/A'),
+                        'gps': data.get('gps', {}).get('fix', 'unknown'),
+                        'recording': data.get('recording', False),
+                        'network_status': data.get('network_status', 'unknown')
+                    }
+    except Exception:
         pass
     
     return None
 
-def scan_network(network_range=None, max_workers=50):
+async def scan_network_async(network_range=None, max_workers=None, session=None,
+                             device_id=None):
     """
     Scan network for EweGoUI devices
     
     Args:
         network_range: Network to scan in CIDR notation (e.g., '192.168.1.0/24')
-        max_workers: Number of concurrent threads for scanning
+        max_workers: Maximum number of concurrent probes (default: 256)
+        session: aiohttp.ClientSession to reuse across scans, so devices found
+            last time are probed over their kept-alive connections
+            (default: a new session for this scan only)
+        device_id: Stop as soon as this device is found (matched against the
+            reported device_id or device_name) and skip the remaining probes
     
     Returns:
         list: List of discovered devices
     """
+    if max_workers is None:
+        max_workers = DEFAULT_MAX_WORKERS
+    
+    if session is None:
+        connector = aiohttp.TCPConnector(limit=max_workers)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            return await scan_network_async(network_range, max_workers, session,
+                                            device_id)
+    
     if network_range is None:
         network_range = get_local_network()
     
@@ -87,37 +192,58 @@ def scan_network(network_range=None, max_workers=50):
     print("=" * 60)
     print(f"\nScanning network: {network_range}")
     print(f"Looking for devices on port 5000...")
-    print(f"This may take 30-60 seconds...\n")
+    print(f"This may take a few seconds...\n")
     
     devices = []
     network = IPv4Network(network_range)
     total_ips = network.num_addresses
+    semaphore = asyncio.Semaphore(max_workers)
+    
+    # Cheap connect sweep first, HTTP only goes to hosts listening on port 5000
+    hosts = [str(ip) for ip in network.hosts()]
+    candidates = await asyncio.to_thread(find_open_hosts, hosts)
+    print(f"  {len(candidates)}/{total_ips} addresses listening on port 5000")
+    
+    async def bounded_check(session, ip):
+        async with semaphore:
+            return await check_device(session, ip)
+    
+    # Scan IPs concurrently on one event loop
+    # Submit all IP checks
+    tasks = [asyncio.ensure_future(bounded_check(session, ip))
+             for ip in candidates]
     
-    # Scan IPs concurrently
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all IP checks
-        future_to_ip = {
-            executor.submit(check_device, str(ip)): str(ip) 
-            for ip in network.hosts()
-        }
+    # Collect results as they arrive
+    for future in asyncio.as_completed(tasks):
+        result = await future
         
-        # Collect results
-        completed = 0
-        for future in concurrent.futures.as_completed(future_to_ip):
-            completed += 1
-            if completed % 50 == 0:
-                print(f"  Scanned {completed}/{total_ips} addresses...")
+        if result:
+            devices.append(result)
+            print(f"\n✅ Found device: {result['device_id']}")
+            print(f"   IP: {result['ip']}")
+            print(f"   Name: {result['device_name']}")
+            print(f"   URL: http://{result['ip']}:5000\n")
             
-            result = future.result()
-            if result:
-                devices.append(result)
-                print(f"\n✅ Found device: {result['device_id']}")
-                print(f"   IP: {result['ip']}")
-                print(f"   Name: {result['device_name']}")
-                print(f"   URL: http://{result['ip']}:5000\n")
+            if device_id is not None and device_id in (result['device_id'], result['device_name']):
+                break
+    
+    # Cancel probes still in flight after an early exit
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
     
     return devices
 
+def scan_network(network_range=None, max_workers=None, device_id=None):
+    """
+    Blocking wrapper around scan_network_async for scripts and threads
+    
+    Returns:
+        list: List of discovered devices
+    """
+    return asyncio.run(scan_network_async(network_range, max_workers,
+                                          device_id=device_id))
+
 def print_summary(devices):
     """Print summary of discovered devices"""
     print("\n" + "=" * 60)
@@ -174,14 +300,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Scan network for EweGo devices (WSL-compatible)')
     parser.add_argument('-n', '--network', type=str, 
                        help='Network to scan (e.g., 192.168.1.0/24)')
-    parser.add_argument('-w', '--workers', type=int, default=50,
-                       help='Number of concurrent workers (default: 50)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                       help='Number of concurrent probes (default: 256)')
+    parser.add_argument('-d', '--device-id', type=str, default=None,
+                       help='Stop scanning once this device is found')
     parser.add_argument('-s', '--save', action='store_true',
                        help='Save discovered devices to file')
     args = parser.parse_args()
     
     # Scan network
-    devices = scan_network(network_range=args.network, max_workers=args.workers)
+    devices = scan_network(network_range=args.network, max_workers=args.workers,
+                           device_id=args.device_id)
     
     # Print summary
     print_summary(devices)
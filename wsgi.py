@@ -0,0 +1,6 @@
+"""
+WSGI entry point for the Raspberry Pi health app
+Usage: gunicorn -c gunicorn_conf.py wsgi:app
+"""
+
+from pi_app import app